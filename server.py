@@ -3,17 +3,87 @@ AI Disaster Response Simulation System - Compressed Version
 All-in-one server with integrated simulation logic
 """
 
+import os
 import random
 import math
 import json
+import heapq
+from collections import deque
 from typing import Dict, List, Tuple, Any, Optional
 from dataclasses import dataclass, field
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response
 from contextlib import asynccontextmanager
 import uvicorn
 
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+DISASTER_TYPES = ("earthquake", "fire", "flood", "hurricane", "tornado")
+
+# Per-injury-level tables, indexed by injury_level - 1 (levels 1-5).
+# Higher initial survival probability - victims should be more resilient
+INITIAL_SURVIVAL_BY_INJURY = tuple(max(0.6, 1.0 - (level - 1) * 0.08) for level in range(1, 6))
+# Critical victims (injury level 4-5) lose survival faster but still slowly
+EXTRA_DECAY_BY_INJURY = (0.0, 0.0, 0.0, 0.002, 0.002)
+
+# Rescue team energy drained per step in each status
+ENERGY_COST_BY_STATUS = {"moving": 2, "rescuing": 5, "transporting": 3}
+
+# Extra A* movement cost per terrain code (R = rocky, W = water)
+TERRAIN_COST = {'R': 0.5, 'W': 0.3}
+
+# Resources spawned on the map for each disaster type
+RESOURCE_MAP = {
+    "earthquake": {"ambulance": 3, "medical_supplies": 4, "heavy_machinery": 1},
+    "fire": {"fire_truck": 4, "medical_supplies": 3, "helicopter": 1},
+    "flood": {"boat": 3, "helicopter": 2, "medical_supplies": 4},
+    "hurricane": {"helicopter": 3, "medical_supplies": 5, "emergency_shelter": 2},
+    "tornado": {"medical_supplies": 4, "ambulance": 2, "heavy_machinery": 1}
+}
+
+# Fallback rescue resource weights when nothing is available nearby
+RESCUE_RESOURCE_WEIGHTS = {
+    "fire": [
+        ("fire_truck", 0.7), ("helicopter", 0.25), ("medical_supplies", 0.05)
+    ],
+    "flood": [
+        ("boat", 0.7), ("helicopter", 0.25), ("medical_supplies", 0.05)
+    ],
+    "earthquake": [
+        ("heavy_machinery", 0.55), ("ambulance", 0.4), ("medical_supplies", 0.05)
+    ],
+    "hurricane": [
+        ("helicopter", 0.7), ("ambulance", 0.25), ("medical_supplies", 0.05)
+    ],
+    "tornado": [
+        ("ambulance", 0.5), ("heavy_machinery", 0.45), ("medical_supplies", 0.05)
+    ]
+}
+
+# Hazard spread multiplier per disaster type for the terrains most susceptible to it (others 1.0)
+SPREAD_BIAS = {
+    "fire": {"G": 1.1, "U": 1.1},
+    "flood": {"G": 1.05, "U": 1.05},
+    "earthquake": {"U": 1.15, "R": 1.15}
+}
+
+# Resource types that may be shown as used_ markers on the map
+USED_RESOURCE_TYPES = frozenset({
+    "ambulance", "fire_truck", "helicopter", "boat", "medical_supplies", "heavy_machinery"
+})
+
+# Most recent steps kept in the telemetry series and event logs; older entries are dropped
+HISTORY_WINDOW = 500
+
+def encode_json(payload: Any) -> bytes:
+    """Encode a plain JSON payload with the same options as Starlette's JSONResponse"""
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
 # ============================================================================
 # DATA STRUCTURES
 # ============================================================================
@@ -40,7 +110,7 @@ class Victim:
 class SimulationState:
     time_step: int
     grid_size: int
-    grid: List[List[str]]
+    grid: List[str]  # one string of terrain codes per row; grid[r][c] is a cell
     hazards: Dict[Tuple[int, int], float]
     victims: List[Victim]
     resources: List[Tuple[int, int, str]]
@@ -52,7 +122,10 @@ class SimulationState:
 # ============================================================================
 
 class DisasterSimulator:
-    def __init__(self, grid_size: int = 20):
+    # 8-connected neighbour offsets in row-major order; spread draws and escape tie-breaks follow it
+    _NBR8 = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+    def __init__(self, grid_size: int = 20, seed: Optional[int] = None):
         self.grid_size = grid_size
         self.state: Optional[SimulationState] = None
         self.stats = {
@@ -65,18 +138,39 @@ class DisasterSimulator:
             'resources_used_history': []
         }
         self.current_target: Optional[Tuple[int, int]] = None
+        # Bumped on every mutation so clients can tell whether their copy is stale
+        self.state_version = 0
+        # (state_version, encoded serialize_state()) so each version is encoded only once
+        self._state_json_cache: Optional[Tuple[int, bytes]] = None
+        # Single RNG behind every random draw (generation, spread, rescues), seeded once
+        # so a run can be reproduced; hot loops bind its methods to locals
+        self._rng = random.Random(seed)
+        # Scratch dict for hazard spread, reused across steps
+        self._spread_buf: Dict[Tuple[int, int], float] = {}
+        # In-bounds 8-neighbours of each flat cell index, built once per grid size
+        self._neighbors = self._build_neighbor_table(grid_size)
+        # Flat per-cell terrain movement penalty and hazard spread multiplier, rebuilt on reset
+        self._terrain_cost: List[float] = []
+        self._spread_bias: List[float] = []
+        # Bumped whenever the hazard dict changes; keys the dense copy below
+        self._hazards_version = 0
+        self._hazard_grid_cache: Optional[Tuple[int, List[float]]] = None
+        # Sum of hazard intensities as of the last _update_hazards
+        self._total_hazard_risk = 0.0
         self.reset()
 
     def reset(self):
         """Generate new single disaster scenario"""
-        disaster_types = ["earthquake", "fire", "flood", "hurricane", "tornado"]
-        disaster_type = random.choice(disaster_types)
+        disaster_type = self._rng.choice(DISASTER_TYPES)
         
         # Generate grid
         grid = self._generate_grid()
         hazards = self._generate_hazards(disaster_type)
         victims = self._generate_victims()
         resources = self._generate_resources(disaster_type)
+        self._terrain_cost = [TERRAIN_COST.get(terrain, 0) for row in grid for terrain in row]
+        bias = SPREAD_BIAS.get(disaster_type, {})
+        self._spread_bias = [bias.get(terrain, 1.0) for row in grid for terrain in row]
         
         self.state = SimulationState(
             time_step=0, grid_size=self.grid_size, grid=grid,
@@ -88,29 +182,50 @@ class DisasterSimulator:
             'victims_saved': 0, 'resources_used': 0, 'time_steps': 0,
             'total_risk': sum(hazards.values()), 'efficiency_score': 0.0,
             'initial_victims': len(victims), 'initial_resources': len(resources),
-            'disaster_type': disaster_type
+            'disaster_type': disaster_type,
+            # Event logs are created up front so hot paths can append without .get() checks;
+            # like the telemetry series they are bounded to the last HISTORY_WINDOW entries
+            'resource_movements': deque(maxlen=HISTORY_WINDOW),
+            'rescue_operations': deque(maxlen=HISTORY_WINDOW)
         }
         self.telemetry = {
-            'risk_history': [self.stats['total_risk']], 'victims_saved_history': [0],
-            'remaining_history': [len(victims)], 'resources_used_history': [0]
+            'risk_history': deque([self.stats['total_risk']], maxlen=HISTORY_WINDOW),
+            'victims_saved_history': deque([0], maxlen=HISTORY_WINDOW),
+            'remaining_history': deque([len(victims)], maxlen=HISTORY_WINDOW),
+            'resources_used_history': deque([0], maxlen=HISTORY_WINDOW)
         }
         self.current_target = None
+        self._hazards_version += 1
+        self.state_version += 1
 
-    def _generate_grid(self) -> List[List[str]]:
-        """Generate terrain grid"""
+    @staticmethod
+    def _build_neighbor_table(size: int) -> List[Tuple[Tuple[int, int, int], ...]]:
+        """For each flat index r * size + c, its in-bounds neighbours as (index, r, c)"""
+        table = []
+        for r in range(size):
+            for c in range(size):
+                table.append(tuple(
+                    (nr * size + nc, nr, nc)
+                    for nr, nc in ((r + dr, c + dc) for dr, dc in DisasterSimulator._NBR8)
+                    if 0 <= nr < size and 0 <= nc < size
+                ))
+        return table
+
+    def _generate_grid(self) -> List[str]:
+        """Generate terrain grid as one string per row"""
         grid = []
         for i in range(self.grid_size):
             row = []
             for j in range(self.grid_size):
                 center_dist = math.sqrt((i - self.grid_size/2)**2 + (j - self.grid_size/2)**2)
                 if center_dist < self.grid_size * 0.3:
-                    terrain = random.choices(['U', 'R', 'S'], weights=[0.6, 0.3, 0.1])[0]
+                    terrain = self._rng.choices(['U', 'R', 'S'], weights=[0.6, 0.3, 0.1])[0]
                 elif center_dist < self.grid_size * 0.6:
-                    terrain = random.choices(['R', 'U', 'G'], weights=[0.4, 0.4, 0.2])[0]
+                    terrain = self._rng.choices(['R', 'U', 'G'], weights=[0.4, 0.4, 0.2])[0]
                 else:
-                    terrain = random.choices(['G', 'R', 'W'], weights=[0.6, 0.3, 0.1])[0]
+                    terrain = self._rng.choices(['G', 'R', 'W'], weights=[0.6, 0.3, 0.1])[0]
                 row.append(terrain)
-            grid.append(row)
+            grid.append("".join(row))
         return grid
 
     def _generate_hazards(self, disaster_type: str) -> Dict[Tuple[int, int], float]:
@@ -119,62 +234,62 @@ class DisasterSimulator:
         
         if disaster_type == "earthquake":
             # Earthquake: 2-3 clear epicenters with defined boundaries
-            num_epicenters = random.randint(2, 3)
+            num_epicenters = self._rng.randint(2, 3)
             for _ in range(num_epicenters):
-                epicenter = (random.randint(3, self.grid_size-4), random.randint(3, self.grid_size-4))
-                radius = random.randint(4, 7)
+                epicenter = (self._rng.randint(3, self.grid_size-4), self._rng.randint(3, self.grid_size-4))
+                radius = self._rng.randint(4, 7)
                 for i in range(self.grid_size):
                     for j in range(self.grid_size):
                         dist = math.sqrt((i - epicenter[0])**2 + (j - epicenter[1])**2)
-                        if dist <= radius and random.random() < 0.9:
+                        if dist <= radius and self._rng.random() < 0.9:
                             intensity = max(0.3, 1.0 - (dist / radius) * 0.6)
                             hazards[(i, j)] = intensity
                             
         elif disaster_type == "fire":
             # Fire: 1-2 clear fire zones with strong boundaries
-            num_fires = random.randint(1, 2)
+            num_fires = self._rng.randint(1, 2)
             for _ in range(num_fires):
-                center = (random.randint(4, self.grid_size-5), random.randint(4, self.grid_size-5))
-                radius = random.randint(5, 8)
+                center = (self._rng.randint(4, self.grid_size-5), self._rng.randint(4, self.grid_size-5))
+                radius = self._rng.randint(5, 8)
                 for i in range(self.grid_size):
                     for j in range(self.grid_size):
                         dist = math.sqrt((i - center[0])**2 + (j - center[1])**2)
-                        if dist <= radius and random.random() < 0.8:
+                        if dist <= radius and self._rng.random() < 0.8:
                             intensity = max(0.2, 1.0 - (dist / radius) * 0.7)
                             hazards[(i, j)] = intensity
                             
         elif disaster_type == "flood":
             # Flood: clear flood zones from one edge
-            edge = random.choice(['top', 'bottom', 'left', 'right'])
-            flood_depth = random.randint(3, 6)
+            edge = self._rng.choice(['top', 'bottom', 'left', 'right'])
+            flood_depth = self._rng.randint(3, 6)
             for i in range(self.grid_size):
                 for j in range(self.grid_size):
                     if edge == 'top' and i <= flood_depth:
                         intensity = max(0.2, 1.0 - (i / flood_depth) * 0.6)
-                        if random.random() < 0.9:
+                        if self._rng.random() < 0.9:
                             hazards[(i, j)] = intensity
                     elif edge == 'bottom' and i >= self.grid_size - flood_depth:
                         intensity = max(0.2, 1.0 - ((self.grid_size - 1 - i) / flood_depth) * 0.6)
-                        if random.random() < 0.9:
+                        if self._rng.random() < 0.9:
                             hazards[(i, j)] = intensity
                     elif edge == 'left' and j <= flood_depth:
                         intensity = max(0.2, 1.0 - (j / flood_depth) * 0.6)
-                        if random.random() < 0.9:
+                        if self._rng.random() < 0.9:
                             hazards[(i, j)] = intensity
                     elif edge == 'right' and j >= self.grid_size - flood_depth:
                         intensity = max(0.2, 1.0 - ((self.grid_size - 1 - j) / flood_depth) * 0.6)
-                        if random.random() < 0.9:
+                        if self._rng.random() < 0.9:
                             hazards[(i, j)] = intensity
                             
         elif disaster_type == "hurricane":
             # Hurricane: clear circular pattern with eye
-            center = (random.randint(self.grid_size//3, 2*self.grid_size//3), 
-                     random.randint(self.grid_size//3, 2*self.grid_size//3))
-            radius = random.randint(6, 9)
+            center = (self._rng.randint(self.grid_size//3, 2*self.grid_size//3), 
+                     self._rng.randint(self.grid_size//3, 2*self.grid_size//3))
+            radius = self._rng.randint(6, 9)
             for i in range(self.grid_size):
                 for j in range(self.grid_size):
                     dist = math.sqrt((i - center[0])**2 + (j - center[1])**2)
-                    if dist <= radius and random.random() < 0.7:
+                    if dist <= radius and self._rng.random() < 0.7:
                         if dist < radius * 0.2:
                             intensity = 0.1  # Eye (calm)
                         elif dist < radius * 0.4:
@@ -185,27 +300,27 @@ class DisasterSimulator:
                         
         elif disaster_type == "tornado":
             # Tornado: clear spiral pattern
-            center = (random.randint(self.grid_size//3, 2*self.grid_size//3), 
-                     random.randint(self.grid_size//3, 2*self.grid_size//3))
-            radius = random.randint(5, 7)
+            center = (self._rng.randint(self.grid_size//3, 2*self.grid_size//3), 
+                     self._rng.randint(self.grid_size//3, 2*self.grid_size//3))
+            radius = self._rng.randint(5, 7)
             for i in range(self.grid_size):
                 for j in range(self.grid_size):
                     dist = math.sqrt((i - center[0])**2 + (j - center[1])**2)
-                    if dist <= radius and random.random() < 0.8:
+                    if dist <= radius and self._rng.random() < 0.8:
                         angle = math.atan2(j - center[1], i - center[0])
                         spiral_factor = abs(math.sin(angle * 2 + dist * 0.4))
                         intensity = max(0.3, (1.0 - dist / radius) * spiral_factor * 0.9)
                         hazards[(i, j)] = intensity
         else:
             # Default: clear scattered hazards
-            num_hazards = random.randint(2, 4)
+            num_hazards = self._rng.randint(2, 4)
             for _ in range(num_hazards):
-                center = (random.randint(3, self.grid_size-4), random.randint(3, self.grid_size-4))
-                radius = random.randint(3, 5)
+                center = (self._rng.randint(3, self.grid_size-4), self._rng.randint(3, self.grid_size-4))
+                radius = self._rng.randint(3, 5)
                 for i in range(self.grid_size):
                     for j in range(self.grid_size):
                         dist = abs(i - center[0]) + abs(j - center[1])
-                        if dist <= radius and random.random() < 0.9:
+                        if dist <= radius and self._rng.random() < 0.9:
                             intensity = max(0.4, 1.0 - (dist / radius) * 0.5)
                             hazards[(i, j)] = intensity
                             
@@ -213,20 +328,18 @@ class DisasterSimulator:
 
     def _generate_victims(self) -> List[Victim]:
         """Generate victims with survival probabilities and injury levels"""
-        count = random.randint(5, 15)
+        count = self._rng.randint(5, 15)
         positions = [(i, j) for i in range(self.grid_size) for j in range(self.grid_size) 
                     if (i, j) != (0, 0)]
-        selected_positions = random.sample(positions, min(count, len(positions)))
+        selected_positions = self._rng.sample(positions, min(count, len(positions)))
         
         victims = []
         for pos in selected_positions:
             # Random injury level (1-5)
-            injury_level = random.randint(1, 5)
-            # Higher initial survival probability - victims should be more resilient
-            survival_prob = max(0.6, 1.0 - (injury_level - 1) * 0.08)  # Higher base survival
+            injury_level = self._rng.randint(1, 5)
             victims.append(Victim(
                 position=pos,
-                survival_probability=survival_prob,
+                survival_probability=INITIAL_SURVIVAL_BY_INJURY[injury_level - 1],
                 time_discovered=0,
                 injury_level=injury_level
             ))
@@ -235,23 +348,15 @@ class DisasterSimulator:
 
     def _generate_resources(self, disaster_type: str) -> List[Tuple[int, int, str]]:
         """Generate disaster-specific resources"""
-        resource_map = {
-            "earthquake": {"ambulance": 3, "medical_supplies": 4, "heavy_machinery": 1},
-            "fire": {"fire_truck": 4, "medical_supplies": 3, "helicopter": 1},
-            "flood": {"boat": 3, "helicopter": 2, "medical_supplies": 4},
-            "hurricane": {"helicopter": 3, "medical_supplies": 5, "emergency_shelter": 2},
-            "tornado": {"medical_supplies": 4, "ambulance": 2, "heavy_machinery": 1}
-        }
-        
         resources = []
-        resource_types = resource_map.get(disaster_type, {"medical_supplies": 3})
+        resource_types = RESOURCE_MAP.get(disaster_type, {"medical_supplies": 3})
+        positions = [(i, j) for i in range(self.grid_size) for j in range(self.grid_size) 
+                   if (i, j) != (0, 0)]
         
         for resource_type, count in resource_types.items():
             for _ in range(count):
-                positions = [(i, j) for i in range(self.grid_size) for j in range(self.grid_size) 
-                           if (i, j) != (0, 0)]
                 if positions:
-                    pos = random.choice(positions)
+                    pos = self._rng.choice(positions)
                     resources.append((pos[0], pos[1], resource_type))
         
         return resources
@@ -281,69 +386,93 @@ class DisasterSimulator:
         
         # Update metrics
         self._update_metrics()
+        self.state_version += 1
         
         return {"message": f"Step {self.state.time_step} completed"}
 
+    def move_team(self, position: Tuple[int, int]):
+        """Teleport the rescue team to a cell and attempt rescues there"""
+        self.state.rescue_team.position = position
+        self._check_rescues()
+        self.state_version += 1
+
     def _update_hazards(self):
         """Spread existing hazards with realistic disaster behavior"""
-        new_hazards = self.state.hazards.copy()
+        hazards = self.state.hazards
+        spread = self._spread_buf
+        spread.clear()
         
         # Calculate current hazard coverage for slowdown
-        hazard_coverage = len(self.state.hazards) / (self.grid_size * self.grid_size)
+        hazard_coverage = len(hazards) / (self.grid_size * self.grid_size)
         spread_slowdown_factor = max(0.2, 1.0 - hazard_coverage * 0.8)  # Slow down as coverage increases
         
+        size = self.grid_size
+        neighbors = self._neighbors
+        spread_bias = self._spread_bias
+        rand = self._rng.random
+        
         # Spread existing hazards (much slower)
-        for (r, c), intensity in self.state.hazards.items():
+        for (r, c), intensity in hazards.items():
             if intensity > 0.4:  # Only spread if hazard is significant
-                # Spread to adjacent cells
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if dr == 0 and dc == 0:
-                            continue
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < self.grid_size and 0 <= nc < self.grid_size:
-                            # Calculate spread probability based on intensity and terrain (much slower)
-                            terrain = self.state.grid[nr][nc]
-                            base_spread_prob = 0.3 if intensity > 0.7 else 0.15  # Much slower base rate
-                            spread_prob = base_spread_prob * spread_slowdown_factor
-                            
-                            # Some terrains are more susceptible to certain disasters (reduced modifiers)
-                            if self.state.disaster_type == 'fire' and terrain in ['G', 'U']:
-                                spread_prob *= 1.1
-                            elif self.state.disaster_type == 'flood' and terrain in ['G', 'U']:
-                                spread_prob *= 1.05
-                            elif self.state.disaster_type == 'earthquake' and terrain in ['U', 'R']:
-                                spread_prob *= 1.15
-                            
-                            if random.random() < spread_prob:
-                                new_intensity = intensity * random.uniform(0.4, 0.7)  # Slower intensity transfer
-                                new_hazards[(nr, nc)] = max(new_hazards.get((nr, nc), 0), new_intensity)
+                base_spread_prob = 0.3 if intensity > 0.7 else 0.15  # Much slower base rate
+                spread_prob = base_spread_prob * spread_slowdown_factor
+                # Spread to adjacent cells; some terrains are more susceptible to certain
+                # disasters, which the per-cell bias built on reset accounts for
+                for idx, nr, nc in neighbors[r * size + c]:
+                    if rand() < spread_prob * spread_bias[idx]:
+                        # uniform(0.4, 0.7) spelled as random.uniform computes it; (0.7 - 0.4) is not exactly 0.3
+                        new_intensity = intensity * (0.4 + (0.7 - 0.4) * rand())  # Slower intensity transfer
+                        spread[(nr, nc)] = max(spread.get((nr, nc), 0), new_intensity)
         
-        # Intensify existing hazards over time (slower changes)
-        for pos in list(new_hazards.keys()):
-            if new_hazards[pos] > 0.3:
-                # Hazards can intensify or weaken randomly (smaller changes)
-                change = random.uniform(-0.02, 0.05)
-                new_hazards[pos] = max(0.1, min(1.0, new_hazards[pos] + change))
+        # Merge spread into the live dict only after every source cell has been read
+        for pos, new_intensity in spread.items():
+            hazards[pos] = max(hazards.get(pos, 0), new_intensity)
         
-        # Remove very weak hazards
-        self.state.hazards = {k: v for k, v in new_hazards.items() if v > 0.1}
+        # Intensify existing hazards over time (slower changes) and remove very weak ones.
+        # The same pass totals the surviving intensities for _update_metrics.
+        total_risk = 0
+        for pos, intensity in list(hazards.items()):
+            if intensity > 0.3:
+                # Hazards can intensify or weaken randomly (smaller changes)
+                change = -0.02 + 0.07 * rand()
+                intensity = hazards[pos] = max(0.1, min(1.0, intensity + change))
+            if intensity <= 0.1:
+                del hazards[pos]
+            else:
+                total_risk += intensity
         
         # Add new random hazards occasionally (much slower escalation)
         # Only add new hazards if coverage is still relatively low
         if hazard_coverage < 0.7:  # Only if less than 70% covered
             escalation_chance = max(0.005, 0.03 - hazard_coverage * 0.04)  # Much slower
-            if random.random() < escalation_chance:
-                self._add_random_hazard()
+            if rand() < escalation_chance:
+                total_risk += self._add_random_hazard()
+        
+        self._total_hazard_risk = total_risk
+        self._hazards_version += 1
+
+    def _hazard_grid(self) -> List[float]:
+        """Dense flat copy of the hazard dict (index r * size + c), rebuilt only after hazards change"""
+        cache = self._hazard_grid_cache
+        if cache is None or cache[0] != self._hazards_version:
+            size = self.grid_size
+            dense = [0.0] * (size * size)
+            for (r, c), intensity in self.state.hazards.items():
+                dense[r * size + c] = intensity
+            cache = self._hazard_grid_cache = (self._hazards_version, dense)
+        return cache[1]
 
     def _update_victim_survival(self):
         """Update victim survival probabilities over time (much slower decrease)"""
-        dead_victims = []
+        hazards = self.state.hazards
+        time_step = self.state.time_step
+        survivors = []
         
+        # Decay and pruning share one pass; dead victims are simply not carried over
         for victim in self.state.victims:
             # Decrease survival probability based on time and hazard intensity (much slower)
-            hazard_intensity = self.state.hazards.get(victim.position, 0)
-            time_factor = self.state.time_step - victim.time_discovered
+            hazard_intensity = hazards.get(victim.position, 0)
+            time_factor = time_step - victim.time_discovered
             
             # Much slower survival decrease with caps for longer lifespan
             base_decay = min(0.05, time_factor * 0.002)  # very gentle over time
@@ -351,42 +480,47 @@ class DisasterSimulator:
             survival_decrease = base_decay + hazard_decay
             # absolute per-step cap to avoid sudden drops
             survival_decrease = min(survival_decrease, 0.01)
-            victim.survival_probability = max(0.0, victim.survival_probability - survival_decrease)
-            
-            # Critical victims (injury level 4-5) lose survival faster but still slowly
-            if victim.injury_level >= 4:
-                victim.survival_probability = max(0.0, victim.survival_probability - 0.002)
+            # Plus the injury-level penalty; critical victims lose survival faster but still slowly
+            victim.survival_probability = max(
+                0.0, victim.survival_probability - survival_decrease - EXTRA_DECAY_BY_INJURY[victim.injury_level - 1]
+            )
             
             # Only mark victims as dead if survival probability is extremely low (almost impossible to rescue)
             if victim.survival_probability <= 0.0:  # only remove when exactly dead
-                dead_victims.append(victim)
+                print(f"💀 Victim at {victim.position} has died (survival: {victim.survival_probability:.2f})")
+            else:
+                survivors.append(victim)
         
         # Remove dead victims from the simulation
-        for dead_victim in dead_victims:
-            self.state.victims.remove(dead_victim)
-            print(f"💀 Victim at {dead_victim.position} has died (survival: {dead_victim.survival_probability:.2f})")
+        if len(survivors) != len(self.state.victims):
+            self.state.victims[:] = survivors
 
     def _update_rescue_team_status(self):
         """Update rescue team energy and fatigue"""
         team = self.state.rescue_team
+        status = team.status
         
         # Energy decreases with movement and rescue operations
-        if team.status == "moving":
-            team.energy = max(0, team.energy - 2)
-        elif team.status == "rescuing":
-            team.energy = max(0, team.energy - 5)
-        elif team.status == "transporting":
-            team.energy = max(0, team.energy - 3)
+        energy = team.energy
+        cost = ENERGY_COST_BY_STATUS.get(status)
+        if cost:
+            energy -= cost
+            if energy <= 0:
+                energy = 0
         
         # Fatigue increases as energy decreases
-        team.fatigue = (100 - team.energy) / 100.0
+        fatigue = team.fatigue = (100 - energy) / 100.0
         
         # Efficiency decreases with fatigue
-        team.efficiency = max(0.3, 1.0 - (team.fatigue * 0.7))
+        efficiency = 1.0 - (fatigue * 0.7)
+        team.efficiency = 0.3 if efficiency <= 0.3 else efficiency
         
         # Energy slowly recovers when idle
-        if team.status == "idle" and team.energy < 100:
-            team.energy = min(100, team.energy + 1)
+        if status == "idle" and energy < 100:
+            energy += 1
+            if energy >= 100:
+                energy = 100
+        team.energy = energy
 
     def _ai_move(self):
         """AI moves rescue team with advanced pathfinding to save all victims"""
@@ -406,11 +540,8 @@ class DisasterSimulator:
                     break
         # If no valid current target, choose nearest victim (align with recommend endpoint)
         if not target_victim:
-            if self.state.victims:
-                target_victim = min(
-                    self.state.victims,
-                    key=lambda v: abs(v.position[0] - team_pos[0]) + abs(v.position[1] - team_pos[1])
-                )
+            target_victim = self._nearest_victim(team_pos)
+            if target_victim:
                 self.current_target = target_victim.position
 
         # Compute path to chosen target
@@ -437,7 +568,6 @@ class DisasterSimulator:
                 new_pos = team_pos
         
         # Track resource movement
-        self.stats['resource_movements'] = self.stats.get('resource_movements', [])
         self.stats['resource_movements'].append({
             'step': self.state.time_step,
             'resource': 'rescue_team',
@@ -446,7 +576,7 @@ class DisasterSimulator:
             'action': 'moving_to_victim',
             'target': best_victim.position if best_victim else None,
             'path_length': len(best_path) if best_path else 0,
-            'path_risk': self._calculate_path_risk(team_pos, best_victim.position) if best_victim else 0
+            'path_risk': self._path_risk(best_path) if best_victim else 0
         })
         
         # Move if the new position is valid
@@ -456,18 +586,22 @@ class DisasterSimulator:
 
     def _check_rescues(self):
         """Check if rescue team can rescue victims with resource usage tracking"""
-        team_pos = self.state.rescue_team.position
+        team = self.state.rescue_team
+        # Cheapest check first: without resources nobody can be rescued, so skip the victim scan
+        if team.resources <= 0:
+            return
+        team_pos = team.position
         rescued = []
         
         for victim in self.state.victims:
-            if victim.position == team_pos and self.state.rescue_team.resources > 0:
+            if victim.position == team_pos and team.resources > 0:
                 # Check if rescue is successful based on survival probability and team efficiency
                 # Make rescue more likely - base success rate + survival bonus
                 base_success_rate = 0.7  # 70% base success rate
                 survival_bonus = victim.survival_probability * 0.3  # Up to 30% bonus
                 rescue_success_rate = min(0.95, base_success_rate + survival_bonus)  # Cap at 95%
                 
-                if random.random() < rescue_success_rate:
+                if self._rng.random() < rescue_success_rate:
                     self.state.rescue_team.resources -= 1
                     self.stats['victims_saved'] += 1
                     rescued.append(victim)
@@ -480,7 +614,6 @@ class DisasterSimulator:
                     available_resources = self._get_available_resources_nearby(team_pos)
                     used_resources = self._select_resources_for_rescue(available_resources)
                     # Track rescue operation with specific resource usage
-                    self.stats['rescue_operations'] = self.stats.get('rescue_operations', [])
                     self.stats['rescue_operations'].append({
                         'step': self.state.time_step,
                         'victim': victim.position,
@@ -496,11 +629,26 @@ class DisasterSimulator:
                 else:
                     print(f"❌ RESCUE FAILED at {victim.position} (survival: {victim.survival_probability:.2f}, efficiency: {self.state.rescue_team.efficiency:.2f})")
         
-        for victim in rescued:
-            self.state.victims.remove(victim)
-            # Clear target if it was the rescued victim
-            if self.current_target == victim.position:
-                self.current_target = None
+        if rescued:
+            # Remove rescued victims from the simulation
+            rescued_ids = {id(victim) for victim in rescued}
+            self.state.victims[:] = [v for v in self.state.victims if id(v) not in rescued_ids]
+            for victim in rescued:
+                # Clear target if it was the rescued victim
+                if self.current_target == victim.position:
+                    self.current_target = None
+
+    def _nearest_victim(self, pos) -> Optional[Victim]:
+        """Victim closest to pos by Manhattan distance (earliest wins ties)"""
+        pr, pc = pos
+        nearest = None
+        nearest_dist = 0
+        for victim in self.state.victims:
+            vr, vc = victim.position
+            dist = abs(vr - pr) + abs(vc - pc)
+            if nearest is None or dist < nearest_dist:
+                nearest, nearest_dist = victim, dist
+        return nearest
 
     def _find_best_victim_with_path(self, team_pos):
         """Find the best victim to rescue using A* pathfinding"""
@@ -517,7 +665,7 @@ class DisasterSimulator:
             if path:
                 # Calculate total cost considering path length, risk, urgency, and energy
                 path_length = len(path)
-                path_risk = self._calculate_path_risk(team_pos, victim.position)
+                path_risk = self._path_risk(path)
                 urgency_factor = 1.0 - victim.survival_probability  # Higher urgency for lower survival
                 energy_factor = 1.0 - (self.state.rescue_team.energy / 100.0)  # Higher cost when low energy
                 
@@ -532,74 +680,58 @@ class DisasterSimulator:
 
     def _astar_pathfinding(self, start, goal):
         """A* pathfinding algorithm to find optimal path"""
-        def get_cost(pos):
-            r, c = pos
-            if not (0 <= r < self.grid_size and 0 <= c < self.grid_size):
-                return float('inf')
-            
-            # Base movement cost
-            base_cost = 1.0
-            
-            # Hazard penalty (reduced for better pathfinding)
-            hazard_cost = self.state.hazards.get(pos, 0) * 1.5
-            
-            # Terrain penalty
-            terrain = self.state.grid[r][c]
-            terrain_cost = 0
-            if terrain == 'R':  # Rocky terrain
-                terrain_cost = 0.5
-            elif terrain == 'W':  # Water
-                terrain_cost = 0.3
-            
-            return base_cost + hazard_cost + terrain_cost
+        # Everything the inner loop touches is bound to a local; cost and heuristic are computed inline
+        hazard_at = self._hazard_grid()
+        terrain_cost = self._terrain_cost
+        neighbors = self._neighbors
+        size = self.grid_size
+        gr, gc = goal
+        heappush, heappop = heapq.heappush, heapq.heappop
         
-        def heuristic(pos):
-            return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+        # Per-cell search state lives in flat lists indexed by r * size + c; heap entries are (f, index) pairs
+        cells = size * size
+        g_score = [math.inf] * cells
+        came_from = [-1] * cells
+        closed = bytearray(cells)
+        start_idx = start[0] * size + start[1]
+        goal_idx = gr * size + gc
+        g_score[start_idx] = 0
         
-        # A* algorithm
-        import heapq
-        open_set = [(heuristic(start), start)]
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: heuristic(start)}
-        closed_set = set()
+        # A* algorithm. Improved nodes are re-pushed rather than re-keyed (lazy deletion);
+        # stale heap entries are skipped once their node has been closed.
+        open_set = [(abs(start[0] - gr) + abs(start[1] - gc), start_idx)]
         
         while open_set:
-            current_f, current = heapq.heappop(open_set)
+            _, current = heappop(open_set)
             
-            if current in closed_set:
+            if closed[current]:
                 continue
                 
-            closed_set.add(current)
+            closed[current] = 1
             
-            if current == goal:
+            if current == goal_idx:
                 # Reconstruct path
-                path = [current]
-                while current in came_from:
+                path = []
+                while current != -1:
+                    path.append(divmod(current, size))
                     current = came_from[current]
-                    path.append(current)
                 return path[::-1]
             
-            # Check all 8 directions
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    neighbor = (current[0] + dr, current[1] + dc)
-                    
-                    if not (0 <= neighbor[0] < self.grid_size and 0 <= neighbor[1] < self.grid_size):
-                        continue
-                    
-                    if neighbor in closed_set:
-                        continue
-                    
-                    tentative_g_score = g_score[current] + get_cost(neighbor)
-                    
-                    if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                        came_from[neighbor] = current
-                        g_score[neighbor] = tentative_g_score
-                        f_score[neighbor] = g_score[neighbor] + heuristic(neighbor)
-                        heapq.heappush(open_set, (f_score[neighbor], neighbor))
+            current_g = g_score[current]
+            
+            # Check all 8 directions (precomputed, already bounds-checked)
+            for neighbor, nr, nc in neighbors[current]:
+                if closed[neighbor]:
+                    continue
+                
+                # Base movement cost + hazard penalty (reduced for better pathfinding) + terrain penalty
+                step_cost = 1.0 + hazard_at[neighbor] * 1.5 + terrain_cost[neighbor]
+                tentative_g_score = current_g + step_cost
+                
+                if tentative_g_score < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g_score
+                    heappush(open_set, (tentative_g_score + (abs(nr - gr) + abs(nc - gc)), neighbor))
         
         # Fallback to simple pathfinding if A* fails
         return self._find_simple_path(start, goal)
@@ -637,51 +769,42 @@ class DisasterSimulator:
         
         return path if current == goal else None
 
-    def _calculate_path_risk(self, start, goal):
-        """Calculate total risk along a path"""
-        path = self._astar_pathfinding(start, goal)
-        if not path:
-            return float('inf')
-        
+    def _path_risk(self, path):
+        """Calculate total risk along an already computed path"""
+        hazards = self.state.hazards
         total_risk = 0
         for pos in path:
-            total_risk += self.state.hazards.get(pos, 0)
-        
+            total_risk += hazards.get(pos, 0)
         return total_risk
 
     def _emergency_escape(self, current_pos):
         """Find the safest adjacent cell when no path to victims exists"""
-        safe_positions = []
-        
-        # Check all 8 directions
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                new_pos = (current_pos[0] + dr, current_pos[1] + dc)
-                
-                if 0 <= new_pos[0] < self.grid_size and 0 <= new_pos[1] < self.grid_size:
-                    risk = self.state.hazards.get(new_pos, 0)
-                    safe_positions.append((new_pos, risk))
+        hazards = self.state.hazards
+        size = self.grid_size
+        r, c = current_pos
+        safest_pos = None
+        safest_risk = 0
         
-        if not safe_positions:
-            return current_pos
-        
-        # Sort by risk (safest first)
-        safe_positions.sort(key=lambda x: x[1])
+        # Check all 8 directions in row-major order; the first minimum wins ties
+        for dr, dc in DisasterSimulator._NBR8:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < size and 0 <= nc < size:
+                risk = hazards.get((nr, nc), 0)
+                if safest_pos is None or risk < safest_risk:
+                    safest_pos, safest_risk = (nr, nc), risk
         
         # Return the safest position
-        return safe_positions[0][0]
+        return safest_pos if safest_pos is not None else current_pos
 
     def _get_available_resources_nearby(self, position):
         """Get available resources near a position"""
         nearby_resources = []
+        pr, pc = position
         for r, c, resource_type in self.state.resources:
             # Skip markers of already used resources
             if isinstance(resource_type, str) and resource_type.startswith('used_'):
                 continue
-            distance = abs(r - position[0]) + abs(c - position[1])
-            if distance <= 4:  # Expanded search radius for better variety
+            if abs(r - pr) + abs(c - pc) <= 4:  # Expanded search radius for better variety
                 nearby_resources.append((r, c, resource_type))
         return nearby_resources
 
@@ -694,31 +817,14 @@ class DisasterSimulator:
             # Pick one primary nearby resource (avoid always medical if others exist)
             non_med = [r for r in available_resources if r[2] != "medical_supplies"]
             primary_pool = non_med if non_med else available_resources
-            primary = random.choice(primary_pool)[2]
+            primary = self._rng.choice(primary_pool)[2]
             chosen.append(primary)
         else:
             # Disaster-specific fallback selection to ensure variety
             disaster = self.state.disaster_type or "earthquake"
-            weights_map = {
-                "fire": [
-                    ("fire_truck", 0.7), ("helicopter", 0.25), ("medical_supplies", 0.05)
-                ],
-                "flood": [
-                    ("boat", 0.7), ("helicopter", 0.25), ("medical_supplies", 0.05)
-                ],
-                "earthquake": [
-                    ("heavy_machinery", 0.55), ("ambulance", 0.4), ("medical_supplies", 0.05)
-                ],
-                "hurricane": [
-                    ("helicopter", 0.7), ("ambulance", 0.25), ("medical_supplies", 0.05)
-                ],
-                "tornado": [
-                    ("ambulance", 0.5), ("heavy_machinery", 0.45), ("medical_supplies", 0.05)
-                ]
-            }
-            pool = weights_map.get(disaster, [("medical_supplies", 1.0)])
+            pool = RESCUE_RESOURCE_WEIGHTS.get(disaster, [("medical_supplies", 1.0)])
             # Weighted choice
-            rnd = random.random()
+            rnd = self._rng.random()
             acc = 0.0
             primary = pool[-1][0]
             for name, w in pool:
@@ -729,7 +835,7 @@ class DisasterSimulator:
             chosen.append(primary)
 
         # Optionally add medical supplies as a secondary supportive resource
-        if "medical_supplies" not in chosen and random.random() < 0.3:
+        if "medical_supplies" not in chosen and self._rng.random() < 0.3:
             chosen.append("medical_supplies")
 
         return chosen
@@ -745,32 +851,33 @@ class DisasterSimulator:
             # Normalize resource key and add used_ marker
             normalized = res
             # Only allow known resource types
-            allowed = {"ambulance", "fire_truck", "helicopter", "boat", "medical_supplies", "heavy_machinery"}
-            if normalized not in allowed:
+            if normalized not in USED_RESOURCE_TYPES:
                 normalized = "medical_supplies"
             used_key = f"used_{normalized}"
             self.state.resources.append((r, c, used_key))
             # Count usage in stats
-            self.stats['resources_used'] = self.stats.get('resources_used', 0) + 1
+            self.stats['resources_used'] += 1
 
-    def _add_random_hazard(self):
-        """Add a new random hazard to simulate disaster escalation"""
+    def _add_random_hazard(self) -> float:
+        """Add a new random hazard to simulate disaster escalation; returns its intensity (0 if none)"""
         # Find a random position not already hazardous
         attempts = 0
         while attempts < 50:
-            r = random.randint(0, self.grid_size - 1)
-            c = random.randint(0, self.grid_size - 1)
+            r = self._rng.randint(0, self.grid_size - 1)
+            c = self._rng.randint(0, self.grid_size - 1)
             if (r, c) not in self.state.hazards:
                 # Add new hazard with moderate intensity
-                intensity = random.uniform(0.3, 0.6)
+                intensity = self._rng.uniform(0.3, 0.6)
                 self.state.hazards[(r, c)] = intensity
                 print(f"New hazard appeared at ({r}, {c}) with intensity {intensity:.2f}")
-                break
+                return intensity
             attempts += 1
+        return 0
 
     def _update_metrics(self):
         """Update simulation statistics"""
-        total_risk = sum(self.state.hazards.values())
+        # Summed by _update_hazards while it walked the hazards this step
+        total_risk = self._total_hazard_risk
         self.stats['total_risk'] += total_risk
         self.stats['efficiency_score'] = (self.stats['victims_saved'] / 
                                         max(1, self.stats['resources_used'] + self.stats['time_steps']))
@@ -787,6 +894,7 @@ class DisasterSimulator:
         
         return {
             "time_step": self.state.time_step,
+            "state_version": self.state_version,
             "grid_size": self.state.grid_size,
             "grid": self.state.grid,
             "hazards": [[r, c, intensity] for (r, c), intensity in self.state.hazards.items()],
@@ -815,10 +923,25 @@ class DisasterSimulator:
                 "status": self.state.rescue_team.status
             },
             "disaster_type": self.state.disaster_type,
-            "metrics": self.stats,
-            "telemetry": self.telemetry
+            "metrics": self._serialize_metrics(),
+            "telemetry": {name: list(series) for name, series in self.telemetry.items()}
         }
 
+    def serialize_state_json(self) -> bytes:
+        """Encoded serialize_state(), re-encoded only when state_version changes"""
+        cache = self._state_json_cache
+        if cache is None or cache[0] != self.state_version:
+            body = encode_json(self.serialize_state())
+            cache = self._state_json_cache = (self.state_version, body)
+        return cache[1]
+
+    def _serialize_metrics(self) -> Dict[str, Any]:
+        """Copy of the stats with the bounded event logs converted to plain lists"""
+        metrics = dict(self.stats)
+        metrics['resource_movements'] = list(metrics['resource_movements'])
+        metrics['rescue_operations'] = list(metrics['rescue_operations'])
+        return metrics
+
 # ============================================================================
 # FASTAPI SERVER
 # ============================================================================
@@ -832,32 +955,60 @@ async def lifespan(app: FastAPI):
     print("🛑 AI Disaster Response Simulation System shutting down")
 
 app = FastAPI(title="AI Disaster Response Simulation", lifespan=lifespan)
+# State payloads are dominated by terrain rows and hazard triples, which compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 simulator = DisasterSimulator()
+# Distinguishes ETags across server restarts, since state_version starts over
+_boot_id = os.urandom(4).hex()
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison: '*' or any listed tag equal once W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+def state_response(**fields: Any) -> Response:
+    """Respond with {**fields, "state": ...}, splicing in the cached encoded state"""
+    head = encode_json(fields)[:-1] + b',' if fields else b'{'
+    return Response(content=head + b'"state":' + simulator.serialize_state_json() + b'}',
+                    media_type="application/json")
 
 @app.get("/")
 async def serve_index():
     return FileResponse("web/index.html")
 
 @app.get("/api/state")
-async def get_state():
-    return {"state": simulator.serialize_state()}
+async def get_state(request: Request):
+    # Pollers that already hold this state_version get an empty 304 instead of the full body
+    # Weak tag: GZipMiddleware serves gzip and identity bodies for the same version
+    etag = f'W/"{_boot_id}-{simulator.state_version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response = state_response()
+    response.headers.update(headers)
+    return response
 
 @app.post("/api/reset")
 async def reset_simulation():
     simulator.reset()
-    return {"message": "Simulation reset", "state": simulator.serialize_state()}
+    return state_response(message="Simulation reset")
 
 @app.post("/api/step")
 async def step_simulation():
     result = simulator.step()
-    return {"result": result, "state": simulator.serialize_state()}
+    return state_response(result=result)
 
 @app.post("/api/move")
 async def move_team(data: dict):
     r, c = data.get("r", 0), data.get("c", 0)
     if 0 <= r < simulator.grid_size and 0 <= c < simulator.grid_size:
-        simulator.state.rescue_team.position = (r, c)
-        simulator._check_rescues()
+        simulator.move_team((r, c))
         return {"ok": True, "message": f"Moved to ({r},{c})"}
     return {"ok": False, "message": "Invalid coordinates"}
 
@@ -874,7 +1025,7 @@ async def recommend_path():
         return {"error": "No victims to rescue"}
     
     # Find nearest victim using A* pathfinding
-    nearest_victim = min(victims, key=lambda v: abs(v.position[0] - rescue_team.position[0]) + abs(v.position[1] - rescue_team.position[1]))
+    nearest_victim = simulator._nearest_victim(rescue_team.position)
     
     # Generate path using A* pathfinding
     path = simulator._astar_pathfinding(rescue_team.position, nearest_victim.position)
@@ -882,7 +1033,7 @@ async def recommend_path():
     # Calculate path metrics
     path_length = len(path) if path else 0
     estimated_time = path_length * 2  # 2 seconds per step
-    risk_level = simulator._calculate_path_risk(rescue_team.position, nearest_victim.position) if path else 0
+    risk_level = simulator._path_risk(path) if path else 0
     
     # Align AI to follow this recommendation
     simulator.current_target = nearest_victim.position
@@ -904,14 +1055,22 @@ async def health_check():
 app.mount("/", StaticFiles(directory="web", html=True), name="static")
 
 if __name__ == "__main__":
+    # Auto-reload and per-request access logs are development aids; enable them with DEV=1.
+    # The simulator lives in process memory, so the server always runs a single worker.
+    dev_mode = os.getenv("DEV") == "1"
     print("🚀 Starting AI Disaster Response Simulation Server...")
     print("📊 Professional Dashboard: http://localhost:8000")
     print("🔧 API Documentation: http://localhost:8000/docs")
     print("⚡ Server running on http://127.0.0.1:8000")
-    print("🔄 Auto-reload enabled - server will restart on file changes")
+    if dev_mode:
+        print("🔄 Auto-reload enabled - server will restart on file changes")
     try:
-        uvicorn.run("server:app", host="127.0.0.1", port=8000, reload=True, log_level="info")
+        # .history/ holds editor autosaves of server.py; don't let them trigger reloads
+        uvicorn.run("server:app", host="127.0.0.1", port=8000, reload=dev_mode,
+                    reload_excludes=[".history/*"] if dev_mode else None,
+                    access_log=dev_mode, log_level="info" if dev_mode else "warning")
     except Exception as e:
         print(f"Error starting server: {e}")
         print("Trying alternative startup method...")
-        uvicorn.run(app, host="127.0.0.1", port=8000, reload=False, log_level="info")
+        uvicorn.run(app, host="127.0.0.1", port=8000, reload=False,
+                    access_log=dev_mode, log_level="info" if dev_mode else "warning")
@@ -5,36 +5,39 @@ Simple startup script for the AI Disaster Response Simulation System
 
 import sys
 import os
-import subprocess
 
 def main():
     print("🚀 AI Disaster Response Simulation System")
     print("=" * 50)
     
-    # Check if we're in the right directory
-    if not os.path.exists("server.py"):
-        print("❌ Error: server.py not found. Please run this script from the project directory.")
+    # The server runs in this process. A missing server.py fails the import; a missing
+    # web/ directory fails the static mount.
+    try:
+        import uvicorn
+        from server import app
+    except (ImportError, RuntimeError) as e:
+        print(f"❌ Error loading server: {e}")
+        print("Please run this script from the project directory with all files and requirements installed.")
         sys.exit(1)
     
-    # Check if web directory exists
-    if not os.path.exists("web"):
-        print("❌ Error: web directory not found. Please ensure all files are present.")
-        sys.exit(1)
+    # Same settings as `python server.py`: DEV=1 enables auto-reload and access logs
+    dev_mode = os.getenv("DEV") == "1"
     
-    print("✅ All files found. Starting server...")
+    print("✅ Server loaded. Starting...")
     print("📊 Dashboard will be available at: http://localhost:8000")
     print("🔧 API docs will be available at: http://localhost:8000/docs")
+    if dev_mode:
+        print("🔄 Auto-reload enabled - server will restart on file changes")
     print("🛑 Press Ctrl+C to stop the server")
     print("=" * 50)
     
     try:
-        # Start the server
-        subprocess.run([sys.executable, "server.py"], check=True)
+        # Auto-reload re-imports the app, so it needs the import string rather than the object
+        uvicorn.run("server:app" if dev_mode else app, host="127.0.0.1", port=8000, reload=dev_mode,
+                    reload_excludes=[".history/*"] if dev_mode else None,
+                    access_log=dev_mode, log_level="info" if dev_mode else "warning")
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error starting server: {e}")
-        sys.exit(1)
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         sys.exit(1)